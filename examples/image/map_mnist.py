@@ -30,7 +30,6 @@ print(embeddings.shape)
 atlas.map_data(embeddings=embeddings,
                      data=datums,
                      id_field='id',
-                     colorable_fields=['label'],
                      topic_model=False
                      )
 
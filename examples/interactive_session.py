@@ -11,7 +11,6 @@ documents = [dataset[i] for i in subset_idxs]
 dataset = atlas.map_data(data=documents,
                           indexed_field='text',
                           identifier='News Dataset 25k',
-                          colorable_fields=['label'],
                           description='News Dataset 25k'
                           )
 
@@ -15,7 +15,7 @@ from tqdm import tqdm
 from .data_inference import NomicDuplicatesOptions, NomicEmbedOptions, NomicProjectOptions, NomicTopicOptions
 from .dataset import AtlasDataStream, AtlasDataset
 from .settings import *
-from .utils import arrow_iterator, b64int, get_random_name
+from .utils import b64int_vec, get_random_name
 
 
 def map_data(
@@ -51,6 +51,18 @@ def map_data(
         assert isinstance(embeddings, np.ndarray), 'You must pass in a numpy array'
         if embeddings.size == 0:
             raise Exception("Your embeddings cannot be empty")
+        # validate before the dataset is created rather than failing (and deleting it) during upload.
+        if embeddings.ndim != 2:
+            raise ValueError(f"Embeddings must be a 2D numpy array, got shape {embeddings.shape}")
+        if not (np.issubdtype(embeddings.dtype, np.number) or embeddings.dtype == np.bool_):
+            raise ValueError(f"Embeddings must be numeric, got dtype {embeddings.dtype}")
+        if data is not None and len(data) != embeddings.shape[0]:
+            raise ValueError(
+                f"Data and embeddings must have the same number of rows, got {len(data)} and {embeddings.shape[0]}"
+            )
+
+    if data is not None and len(data) == 0:
+        raise Exception("Your data cannot be empty")
 
     if indexed_field is not None:
         modality = 'text'
@@ -58,38 +70,31 @@ def map_data(
     if id_field is None:
         id_field = ATLAS_DEFAULT_ID_FIELD
 
-    project_name = get_random_name()
+    dataset_name = identifier if identifier else get_random_name()
+    index_name = dataset_name
 
-    dataset_name = project_name
-    index_name=dataset_name
-
-    if identifier:
-        dataset_name = identifier
-        index_name = identifier
-    if description:
-        description = description
+    # work on dataframes as arrow tables from here on: ids are added as a column without mutating the user's
+    # dataframe, and the upload path converts to arrow anyway.
+    if isinstance(data, DataFrame):
+        data = pa.Table.from_pandas(data, preserve_index=False)
 
     # no metadata was specified
     added_id_field = False
     if data is None:
-        data = [{ATLAS_DEFAULT_ID_FIELD: b64int(i)} for i in range(len(embeddings))]
+        data = pa.table({ATLAS_DEFAULT_ID_FIELD: b64int_vec(np.arange(len(embeddings)))})
         added_id_field = True
 
     if id_field == ATLAS_DEFAULT_ID_FIELD:
         if isinstance(data, list) and id_field not in data[0]:
             added_id_field = True
-            for i in range(len(data)):
-                # do not modify object the user passed in - also ensures IDs are unique if two input datums are the same *object*
-                data[i] = data[i].copy()
-                data[i][id_field] = b64int(i)
-        elif isinstance(data, DataFrame) and id_field not in data.columns:
-            data[id_field] = [b64int(i) for i in range(data.shape[0])]
-            added_id_field = True
+            ids = b64int_vec(np.arange(len(data))).tolist()
+            # build new dicts in a new list: neither the list nor the objects the user passed in are modified,
+            # and IDs stay unique if two input datums are the same *object*
+            data = [{**datum, id_field: id_} for id_, datum in zip(ids, data)]
         elif isinstance(data, pa.Table) and not id_field in data.column_names:
-            ids = pa.array([b64int(i) for i in range(len(data))])
-            data = data.append_column(id_field, ids)
+            data = data.append_column(id_field, pa.array(b64int_vec(np.arange(len(data)))))
             added_id_field = True
-        elif id_field not in data[0]:
+        elif not isinstance(data, (list, pa.Table)):
             raise ValueError("map_data data must be a list of dicts, a pandas dataframe, or a pyarrow table")
 
     if added_id_field:
@@ -122,7 +127,8 @@ def map_data(
 
     logger.info(f"`{dataset.identifier}`: Data upload succeeded to dataset`")
 
-    projection = dataset.create_index(
+    # create_index looks up the new map through `dataset.indices`, which already refreshes the dataset state.
+    dataset.create_index(
         name=index_name,
         indexed_field=indexed_field,
         modality=modality,
@@ -132,7 +138,6 @@ def map_data(
         embedding_model=embedding_model,
     )
 
-    dataset = dataset._latest_dataset_state()
     return dataset
 
 
@@ -1393,13 +1393,20 @@ class AtlasDataset(AtlasClass):
 
         # Add embeddings to the data.
         # Allow 2d embeddings to stay at single-fp precision.
-        if not (embeddings.shape[1] == 2 and embeddings.dtype == np.float32):
-            embeddings = embeddings.astype(np.float16)
-        # Fail if any embeddings are NaN or Inf.
-        assert not np.isnan(embeddings).any(), "Embeddings must not contain NaN values."
-        assert not np.isinf(embeddings).any(), "Embeddings must not contain Inf values."
+        keep_precision = embeddings.shape[1] == 2 and embeddings.dtype == np.float32
 
-        pyarrow_embeddings = pa.FixedSizeListArray.from_arrays(embeddings.reshape((-1)), embeddings.shape[1])
+        # Convert and check in row chunks so temporaries stay bounded for large embedding matrices.
+        embedding_chunks = []
+        for i in range(0, embeddings.shape[0], MAX_MEMORY_CHUNK):
+            chunk = embeddings[i : i + MAX_MEMORY_CHUNK]
+            if not keep_precision:
+                chunk = chunk.astype(np.float16)
+            # Fail if any embeddings are NaN or Inf.
+            assert not np.isnan(chunk).any(), "Embeddings must not contain NaN values."
+            assert not np.isinf(chunk).any(), "Embeddings must not contain Inf values."
+            embedding_chunks.append(pa.FixedSizeListArray.from_arrays(chunk.reshape((-1)), chunk.shape[1]))
+
+        pyarrow_embeddings = pa.chunked_array(embedding_chunks)
 
         data_with_embeddings = tb.append_column("_embeddings", pyarrow_embeddings)
 
@@ -1468,8 +1475,21 @@ class AtlasDataset(AtlasClass):
         failed = 0
         succeeded = 0
         errors_504 = 0
+        # Keep a bounded number of shards in flight rather than queueing every shard up front,
+        # so a failure is raised without first waiting on the rest of the upload.
+        max_inflight = num_workers * 2
+        shard_starts = iter(range(0, len(data), shard_size))
+
+        def submit_next_shards():
+            while len(futures) < max_inflight:
+                start_point = next(shard_starts, None)
+                if start_point is None:
+                    break
+                futures[executor.submit(send_request, start_point)] = start_point
+
         with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = {executor.submit(send_request, i): i for i in range(0, len(data), shard_size)}
+            futures = {}
+            submit_next_shards()
 
             while futures:
                 # check for status of the futures which are currently working
@@ -1523,6 +1543,8 @@ class AtlasDataset(AtlasClass):
                     # remove the now completed future
                     del futures[future]
 
+                submit_next_shards()
+
         # close the progress bar if this method was called with no external progresbar
         if close_pbar:
             pbar.close()
@@ -1,6 +1,7 @@
 import os
 import random
 import tempfile
+import threading
 import time
 import uuid
 from datetime import datetime, timedelta
@@ -10,8 +11,10 @@ import pandas as pd
 import pyarrow as pa
 import pytest
 import requests
+from pyarrow import feather
 
 from nomic import AtlasDataset, atlas
+from nomic.utils import b64int, b64int_vec
 
 
 def gen_random_datetime(min_year=1900, max_year=datetime.now().year):
@@ -22,6 +25,11 @@ def gen_random_datetime(min_year=1900, max_year=datetime.now().year):
     return start + (end - start) * random.random()
 
 
+def test_b64int_vec():
+    ids = np.concatenate([np.arange(70_000), [2**32 - 1, 2**32, 2**48, 2**63 - 1]])
+    assert b64int_vec(ids).tolist() == [b64int(int(i)) for i in ids]
+
+
 def test_map_idless_embeddings():
     num_embeddings = 50
     embeddings = np.random.rand(num_embeddings, 512)
@@ -74,6 +82,31 @@ def test_map_embeddings_with_errors():
         pass
 
 
+def _fail_on_dataset_creation(*args, **kwargs):
+    raise AssertionError("map_data should reject this input before creating a dataset")
+
+
+def test_map_embeddings_invalid_inputs(monkeypatch):
+    monkeypatch.setattr(atlas, 'AtlasDataset', _fail_on_dataset_creation)
+
+    with pytest.raises(ValueError, match='2D'):
+        atlas.map_data(embeddings=np.random.rand(10))
+
+    with pytest.raises(ValueError, match='numeric'):
+        atlas.map_data(embeddings=np.array([['a', 'b'], ['c', 'd']]))
+
+    with pytest.raises(ValueError, match='same number of rows'):
+        atlas.map_data(embeddings=np.random.rand(10, 4), data=[{'field': str(i)} for i in range(9)])
+
+
+def test_map_empty_data(monkeypatch):
+    monkeypatch.setattr(atlas, 'AtlasDataset', _fail_on_dataset_creation)
+
+    for data in [[], pd.DataFrame({'text': []}), pa.table({'text': pa.array([], type=pa.string())})]:
+        with pytest.raises(Exception, match='cannot be empty'):
+            atlas.map_data(data=data, indexed_field='text')
+
+
 def test_map_text_errors():
     # no indexed field
     name = f'unittest-dataset-{random.randint(0, 100)}'
@@ -372,6 +405,151 @@ def test_map_text_pandas():
     dataset.delete()
 
 
+class _RecordingDataset:
+    """Stands in for AtlasDataset so map_data's input handling can be checked offline."""
+
+    uploads = []
+
+    def __init__(self, *args, **kwargs):
+        self.total_datums = 0
+        self.identifier = 'recording-dataset'
+
+    def add_data(self, data, embeddings=None):
+        _RecordingDataset.uploads.append(data)
+
+    def create_index(self, **kwargs):
+        pass
+
+
+def test_map_text_pandas_input_handling(monkeypatch):
+    monkeypatch.setattr(atlas, 'AtlasDataset', _RecordingDataset)
+    _RecordingDataset.uploads = []
+
+    data = pd.DataFrame({'color': ['red', 'blue', 'green']}, index=[10, 20, 30])
+    original = data.copy()
+
+    atlas.map_data(indexed_field='color', data=data)
+
+    # the caller's dataframe is left as it was: no id column written into it
+    pd.testing.assert_frame_equal(data, original)
+
+    # the upload is an arrow table without the pandas index, with generated ids
+    uploaded = _RecordingDataset.uploads[-1]
+    assert isinstance(uploaded, pa.Table)
+    assert uploaded.column_names == ['color', 'id_']
+    assert uploaded['id_'].to_pylist() == ['AA', 'AQ', 'Ag']
+
+    # a dataframe that already carries the default id field is accepted as is
+    atlas.map_data(indexed_field='color', data=data.assign(id_=['a', 'b', 'c']))
+    assert _RecordingDataset.uploads[-1]['id_'].to_pylist() == ['a', 'b', 'c']
+
+    with pytest.raises(ValueError):
+        atlas.map_data(indexed_field='color', data={'color': ['red']})
+
+
+def _offline_dataset(modality='text'):
+    # an AtlasDataset with just enough state for the upload path, without contacting Atlas
+    dataset = AtlasDataset.__new__(AtlasDataset)
+    dataset.atlas_api_path = 'https://atlas.invalid'
+    dataset.header = {}
+    dataset.meta = {
+        'id': str(uuid.uuid4()),
+        'unique_id_field': 'id',
+        'modality': modality,
+        'insert_update_delete_lock': False,
+        'organization_slug': 'unittest',
+        'slug': 'offline-dataset',
+    }
+    dataset._schema = None
+    return dataset
+
+
+class _FakeResponse:
+    def __init__(self, status_code, body=''):
+        self.status_code = status_code
+        self.text = body
+        self._body = body
+
+    def json(self):
+        return self._body
+
+    def close(self):
+        pass
+
+
+def test_add_data_posts_every_shard_once(monkeypatch):
+    posted_ids = []
+
+    def fake_post(url, headers=None, data=None):
+        posted_ids.append(feather.read_table(data)['id'].to_pylist())
+        return _FakeResponse(200)
+
+    monkeypatch.setattr('nomic.dataset.requests.post', fake_post)
+
+    size = 123_456
+    data = pa.table({'id': [str(i) for i in range(size)], 'text': ['a'] * size})
+    _offline_dataset()._add_data(data)
+
+    # 5,000 row shards: every shard start is posted exactly once
+    assert len(posted_ids) == 25
+    assert sorted(shard[0] for shard in posted_ids) == sorted(str(i) for i in range(0, size, 5_000))
+    assert sorted(i for shard in posted_ids for i in shard) == sorted(str(i) for i in range(size))
+
+
+def test_add_data_failure_stops_submitting_shards(monkeypatch):
+    num_workers = 10
+    lock = threading.Lock()
+    n_posts = 0
+
+    def fake_post(url, headers=None, data=None):
+        nonlocal n_posts
+        with lock:
+            n_posts += 1
+            first = n_posts == 1
+        if first:
+            return _FakeResponse(409, 'Project transaction lock is held')
+        time.sleep(0.05)
+        return _FakeResponse(200)
+
+    monkeypatch.setattr('nomic.dataset.requests.post', fake_post)
+
+    # 40 shards of 5,000 rows
+    size = 200_000
+    data = pa.table({'id': [str(i) for i in range(size)], 'text': ['a'] * size})
+    with pytest.raises(Exception, match='currently indexing'):
+        _offline_dataset()._add_data(data)
+
+    assert n_posts <= 2 * num_workers
+
+
+def test_add_embeddings_in_chunks(monkeypatch):
+    # small chunks so the conversion spans several chunk boundaries
+    monkeypatch.setattr('nomic.dataset.MAX_MEMORY_CHUNK', 7)
+    dataset = _offline_dataset(modality='embedding')
+    uploads = []
+    dataset._add_data = lambda data, pbar=None: uploads.append(data)
+
+    size = 20
+    data = pa.table({'id': [str(i) for i in range(size)]})
+
+    embeddings = np.random.rand(size, 5)
+    dataset._add_embeddings(data=data, embeddings=embeddings)
+    uploaded = np.array(uploads[-1]['_embeddings'].to_pylist(), dtype=np.float16)
+    np.testing.assert_array_equal(uploaded, embeddings.astype(np.float16))
+
+    # 2d float32 embeddings keep their precision
+    embeddings = np.random.rand(size, 2).astype(np.float32)
+    dataset._add_embeddings(data=data, embeddings=embeddings)
+    assert uploads[-1]['_embeddings'].type.value_type == pa.float32()
+    np.testing.assert_array_equal(np.array(uploads[-1]['_embeddings'].to_pylist(), dtype=np.float32), embeddings)
+
+    # a NaN past the first chunk is still caught
+    embeddings = np.random.rand(size, 5)
+    embeddings[17, 3] = np.nan
+    with pytest.raises(AssertionError, match='NaN'):
+        dataset._add_embeddings(data=data, embeddings=embeddings)
+
+
 def test_map_text_arrow():
     size = 50
     data = pa.Table.from_pydict(
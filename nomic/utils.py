@@ -4,12 +4,11 @@ import random
 import sys
 from io import BytesIO
 from typing import Optional
-
-import requests
-import pyarrow as pa
 from uuid import UUID
 
+import numpy as np
 import pyarrow as pa
+import requests
 
 nouns = [
     'newton',
@@ -204,6 +203,36 @@ def b64int(i: int):
     return base64.b64encode(ibytes).decode('utf8').rstrip('=')
 
 
+_B64_ALPHABET = np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/', dtype=np.uint8)
+
+
+def b64int_vec(arr: np.ndarray) -> np.ndarray:
+    '''
+    Vectorized version of `b64int`. Encodes an array of non-negative integers into
+    the same strings `b64int` would produce, without a Python call per element.
+    '''
+    arr = np.asarray(arr)
+    if arr.size and arr.min() < 0:
+        raise ValueError("b64int_vec only supports non-negative integers")
+    raw = arr.astype('>u8').view(np.uint8).reshape(-1, 8)
+    # b64int strips leading zero bytes but always keeps at least one byte.
+    nonzero = raw != 0
+    nbytes = 8 - np.where(nonzero.any(axis=1), nonzero.argmax(axis=1), 7)
+
+    out = np.empty(len(raw), dtype='U11')
+    for n in np.unique(nbytes):
+        rows = np.flatnonzero(nbytes == n)
+        chunk = np.zeros((len(rows), -(-n // 3) * 3), dtype=np.uint32)
+        chunk[:, :n] = raw[rows, 8 - n :]
+        triplets = chunk.reshape(len(rows), -1, 3)
+        packed = (triplets[..., 0] << 16) | (triplets[..., 1] << 8) | triplets[..., 2]
+        sextets = np.stack([packed >> 18, packed >> 12, packed >> 6, packed], axis=-1).reshape(len(rows), -1) & 63
+        n_chars = -(-4 * n // 3)
+        chars = np.ascontiguousarray(_B64_ALPHABET[sextets[:, :n_chars]])
+        out[rows] = chars.view(f'S{n_chars}').ravel().astype('U11')
+    return out
+
+
 def get_random_name():
     return f"{random.choice(adjectives)}-{random.choice(nouns)}"
 